@@ -1,14 +1,18 @@
 import asyncio
-import json
+import itertools
 import logging
+import os
+import re
 import time
-import uuid
-from collections.abc import AsyncIterable
+from collections import OrderedDict
+from collections.abc import AsyncIterable, Coroutine
+from functools import lru_cache
+from typing import Any, Protocol
 
+import orjson
 from livekit import rtc
 from livekit.agents import Agent, StopResponse, llm
 from livekit.agents.voice import ModelSettings
-from livekit.plugins import elevenlabs
 from my_agents.graph import classify_intent
 from my_agents.models import Intent
 from my_agents.models_config import create_chat_llm
@@ -30,33 +34,215 @@ from agent.settings import (
     SESSION_WARNING_THRESHOLD,
     AgentSettings,
     NotificationType,
-    create_llm,
-    create_stt,
+    PluginCache,
 )
 
 logger = logging.getLogger("voice-agent")
 
+CHAT_INSTRUCTIONS = "You are a helpful voice assistant. Keep responses concise and conversational."
+
+# Immediate LLM text is coalesced and written once one of these is hit
+WRITE_BUFFER_SIZE = 2048  # characters
+WRITE_FLUSH_INTERVAL = 0.02  # seconds since the last write
+
+SEND_QUEUE_SIZE = 256  # chunks queued before transcription_node waits on the sender
+# Sentence end: terminal punctuation + whitespace, not after a title/initial
+_SENTENCE_END = re.compile(r"(?<!\b[A-Z])(?<!\bMr|\bMs|\bDr|\bSt)(?<!\bMrs)[.!?]\s")
+
+# Constant part of every streamed segment's attributes
+_ATTR_PARTIAL_TEMPLATE = {ATTR_TRANSCRIPTION_FINAL: "false"}
+
+# Unambiguous task commands skip the classifier. A hit also activates TaskAgent
+# for the following messages, so only the bare imperative shape counts: the noun
+# right after the verb, then end of input ("list my todos"), a ":"/"-" and the
+# item ("new todo: call mom"), or, for adding, "to ..." ("add a task to buy milk").
+# "list tasks a project manager does" or "complete the task of ..." go to the classifier.
+_TASK_TRIGGER_RE = re.compile(
+    r"^(?:"
+    r"(?:add|create|new)\s+(?:(?:a|an|my|the)\s+)?(?:task|todo)s?"
+    r"(?:\s*[:-]\s*\S|\s+to\s+\S|\s*[.!]?\s*$)"
+    r"|(?:list|show|delete|remove|complete|finish)\s+(?:(?:a|an|my|the)\s+)?(?:task|todo)s?"
+    r"(?:\s*[:-]\s*\S|\s*[.!?]?\s*$)"
+    r")",
+    re.IGNORECASE,
+)
+
+# Start classifying on the final transcript, before end-of-turn is detected
+SPECULATIVE_INTENT = True
+
+# Constant head of each notification's JSON, built once per type
+_NOTIFICATION_PREFIXES = {
+    msg_type: b'{"type":' + orjson.dumps(msg_type.value) + b',"session_id":'
+    for msg_type in NotificationType
+}
+
+
+class IntentClassification(Protocol):
+    """The parts of a classify_intent result the agent reads."""
+
+    intent: Intent
+    confidence: float
+
+
+# Confident classifications of short utterances, keyed by (model, normalized text)
+INTENT_CACHE_SIZE = 512
+INTENT_CACHE_MAX_TEXT = 128
+INTENT_CACHE_MIN_CONFIDENCE = 0.8
+_intent_cache: OrderedDict[tuple[str, str], IntentClassification] = OrderedDict()
+
+
+async def classify_intent_cached(text: str, model_id: str) -> IntentClassification:
+    """classify_intent with an LRU for repeated short phrases ("add a task", "cancel")."""
+    normalized = text.strip().lower()
+    if len(normalized) > INTENT_CACHE_MAX_TEXT:
+        return await classify_intent([("user", text)], model_id=model_id)
+
+    key = (model_id, normalized)
+    cached = _intent_cache.get(key)
+    if cached is not None:
+        _intent_cache.move_to_end(key)
+        return cached
+
+    classification = await classify_intent([("user", text)], model_id=model_id)
+    # Only cache confident answers so a borderline call isn't repeated forever
+    if classification.confidence >= INTENT_CACHE_MIN_CONFIDENCE:
+        _intent_cache[key] = classification
+        if len(_intent_cache) > INTENT_CACHE_SIZE:
+            _intent_cache.popitem(last=False)
+    return classification
+
+
+def _short_id() -> str:
+    """Return 8 random hex chars for segment/session ids."""
+    return os.urandom(4).hex()
+
+
+# LangChain chat clients, reused across turns instead of rebuilt per message
+_chat_llm = lru_cache(maxsize=8)(create_chat_llm)
+
+
+class _SegmentSender:
+    """Writes one lk.llm_stream segment from a task, coalescing token-sized chunks.
+
+    Chunks are buffered and written on a size/sentence boundary, or once
+    WRITE_FLUSH_INTERVAL passes without one, so neither tiny writes nor a pause
+    in the LLM stream hold the reader up. The first chunk is written at once.
+    """
+
+    __slots__ = ("_room", "_attributes", "_queue", "_task", "_writer", "_buf", "_len", "_last_ts")
+
+    def __init__(self, room: rtc.Room, attributes: dict[str, str]):
+        self._room = room
+        self._attributes = attributes
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._writer: rtc.TextStreamWriter | None = None
+        # Pending text pieces; TextStreamWriter.write encodes, so keep them as str
+        self._buf: list[str] = []
+        self._len: int = 0
+        self._last_ts: float = 0.0
+        self._task = asyncio.create_task(self._drain())
+
+    async def put(self, text: str) -> None:
+        """Queue a text chunk; only suspends when the writer is SEND_QUEUE_SIZE behind."""
+        if not self._task.done():
+            await self._queue.put(text)
+
+    async def close(self) -> None:
+        """Write what's left and mark the segment as complete."""
+        if not self._task.done():
+            await self._queue.put(None)
+        await self._task
+
+    async def _drain(self) -> None:
+        """Write queued chunks to the room until the None sentinel, then close."""
+        try:
+            while True:
+                timeout = None
+                if self._buf:
+                    elapsed = time.monotonic() - self._last_ts
+                    timeout = max(WRITE_FLUSH_INTERVAL - elapsed, 0)
+                try:
+                    chunk = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    await self._write_buffered()
+                    continue
+                if chunk is None:
+                    break
+                await self._buffer_chunk(chunk)
+            await self._write_buffered()
+        except Exception as e:
+            logger.warning("Immediate text stream failed: %s", e)
+        finally:
+            self._buf.clear()
+            self._len = 0
+            writer, self._writer = self._writer, None
+            if writer:
+                await writer.aclose()
+
+    async def _buffer_chunk(self, text: str) -> None:
+        """Buffer a text chunk, writing to the room on a size/sentence/time boundary."""
+        # A boundary may start in the previous piece ("Hello." + " there"), and
+        # the abbreviation lookbehinds need a few characters before it
+        tail = self._buf[-1][-4:] if self._buf else ""
+        self._buf.append(text)
+        self._len += len(text)
+        if (
+            self._len >= WRITE_BUFFER_SIZE
+            or _SENTENCE_END.search(tail + text, max(len(tail) - 1, 0))
+            or time.monotonic() - self._last_ts > WRITE_FLUSH_INTERVAL
+        ):
+            await self._write_buffered()
+
+    async def _write_buffered(self) -> None:
+        """Write buffered text to the stream, opening it if needed."""
+        if not self._buf:
+            return
+
+        if not self._writer:
+            self._writer = await self._room.local_participant.stream_text(
+                topic=TOPIC_LLM_STREAM,
+                attributes=self._attributes,
+            )
+
+        text = "".join(self._buf)
+        self._buf.clear()
+        self._len = 0
+        self._last_ts = time.monotonic()
+        await self._writer.write(text)
+
 
 class ChatAgent(Agent):
     """Chat mode: STT → LLM → TTS with auto turn detection and immediate text streaming"""
 
-    def __init__(self, settings: AgentSettings):
+    def __init__(self, settings: AgentSettings, plugins: PluginCache):
         super().__init__(
-            instructions="You are a helpful voice assistant. Keep responses concise and conversational.",
-            stt=create_stt(settings.stt_provider),
-            llm=create_llm(settings.llm_model),
-            tts=elevenlabs.TTS() if settings.tts_enabled else None,
+            instructions=CHAT_INSTRUCTIONS,
+            stt=plugins.stt(settings.stt_provider),
+            llm=plugins.llm(settings.llm_model),
+            tts=plugins.tts(settings.tts_enabled),
         )
         self._settings = settings
         self._room: rtc.Room | None = None
-        self._immediate_writer: rtc.TextStreamWriter | None = None
+        # Immediate text is handed to a sender task so slow writes don't gate TTS
+        self._sender: _SegmentSender | None = None
         self._segment_id: str = ""
+        # Segment ids are <kind>_<random per-agent prefix>_<sequence number>;
+        # the prefix keeps them unique across agents recreated in one room
+        self._id_prefix: str = _short_id()
+        self._segment_seq = itertools.count(1)
         self._session_id: str = ""
+        # time.monotonic() of the last completed turn; immune to wall-clock jumps
         self._last_activity_time: float | None = None
-        self._session_warning_sent: bool = False
-        self._session_monitor_task: asyncio.Task[None] | None = None
+        # Inactivity deadlines, re-armed on every completed turn
+        self._warning_handle: asyncio.TimerHandle | None = None
+        self._timeout_handle: asyncio.TimerHandle | None = None
+        # Fire-and-forget notification tasks; the loop only holds weak references
+        self._background_tasks: set[asyncio.Task[None]] = set()
         self._task_agent: TaskAgent | None = None
         self._basidian_agent: BasidianAgent | None = None
+        # Classification started from the final transcript of the current turn
+        self._speculative_text: str = ""
+        self._speculative_intent: tuple[str, asyncio.Task[IntentClassification]] | None = None
         # Response metadata for current stream
         self._current_intent: str | None = None
         self._current_response_type: str = "llm_response"
@@ -65,127 +251,187 @@ class ChatAgent(Agent):
         """Set room reference for immediate text streaming."""
         self._room = room
 
+    def update_settings(self, settings: AgentSettings) -> None:
+        """Apply settings that don't affect STT/LLM/TTS (e.g. excluded_agents)."""
+        self._settings = settings
+
     async def transcription_node(
         self,
         text: AsyncIterable[str],
         model_settings: ModelSettings,
     ) -> AsyncIterable[str]:
         """Stream text immediately while also passing through for TTS sync."""
-        self._segment_id = f"LLM_{uuid.uuid4().hex[:8]}"
+        self._segment_id = f"LLM_{self._id_prefix}_{next(self._segment_seq)}"
+        if self._room:
+            self._sender = _SegmentSender(self._room, self._stream_attributes())
 
-        async for chunk in text:
-            # Send immediately via separate topic
-            if self._room and chunk:
-                await self._send_immediate(chunk)
-            # Also yield for normal synced flow
-            yield chunk
-
-        # Flush immediate stream
-        await self._flush_immediate()
+        try:
+            async for chunk in text:
+                # Send immediately via separate topic
+                if chunk:
+                    await self._send_immediate(chunk)
+                # Also yield for normal synced flow
+                yield chunk
+        finally:
+            # Flush immediate stream (also when the turn is interrupted)
+            await self._flush_immediate()
 
     async def _send_immediate(self, text: str):
-        """Send text chunk immediately to room."""
-        if not self._room:
-            return
+        """Queue a text chunk for the sender task."""
+        if self._sender:
+            await self._sender.put(text)
 
-        if not self._immediate_writer:
-            attrs = {
-                ATTR_SEGMENT_ID: self._segment_id,
-                ATTR_TRANSCRIPTION_FINAL: "false",
-                ATTR_RESPONSE_TYPE: self._current_response_type,
-                ATTR_MODEL: self._settings.llm_model,
-            }
-            if self._current_intent:
-                attrs[ATTR_INTENT] = self._current_intent
-            self._immediate_writer = await self._room.local_participant.stream_text(
-                topic=TOPIC_LLM_STREAM,
-                attributes=attrs,
-            )
-
-        await self._immediate_writer.write(text)
+    def _stream_attributes(self) -> dict[str, str]:
+        """Attributes for a new lk.llm_stream segment."""
+        attrs = {
+            **_ATTR_PARTIAL_TEMPLATE,
+            ATTR_SEGMENT_ID: self._segment_id,
+            ATTR_RESPONSE_TYPE: self._current_response_type,
+            ATTR_MODEL: self._settings.llm_model,
+        }
+        if self._current_intent:
+            attrs[ATTR_INTENT] = self._current_intent
+        return attrs
 
     async def _flush_immediate(self):
-        """Mark immediate stream as complete."""
-        if self._immediate_writer:
-            await self._immediate_writer.aclose()
-            self._immediate_writer = None
+        """Let the sender write what's left and mark immediate stream as complete."""
+        sender, self._sender = self._sender, None
+        if sender:
+            await sender.close()
 
     async def _send_session_notification(self, msg_type: NotificationType, **payload) -> None:
         """Send session notification to frontend via LiveKit data topic."""
         if not self._room:
             return
-        msg = json.dumps(
-            {
-                "type": msg_type,
-                "session_id": self._session_id,
-                "timestamp": time.time(),
-                **payload,
-            }
+        # Only the dynamic fields are serialized per message
+        msg = (
+            _NOTIFICATION_PREFIXES[msg_type]
+            + orjson.dumps(self._session_id)
+            + b',"timestamp":'
+            + orjson.dumps(time.time())
         )
+        if payload:
+            msg += b"," + orjson.dumps(payload)[1:-1]
+        msg += b"}"
         try:
+            # One stream per message: installed clients read each with readAll()
             writer = await self._room.local_participant.stream_text(topic=TOPIC_VAD_STATUS)
-            await writer.write(msg)
+            await writer.write(msg.decode())
             await writer.aclose()
-            logger.debug(f"Session notification sent: {msg_type}")
+            logger.debug("Session notification sent: %s", msg_type)
         except Exception as e:
-            logger.warning(f"Failed to send session notification: {e}")
+            logger.warning("Failed to send session notification: %s", e)
 
     def start_session_timer(self) -> None:
         """Start session inactivity timer when audio track is subscribed."""
-        self._session_id = f"session_{uuid.uuid4().hex[:8]}"
-        self._last_activity_time = time.time()
-        self._session_warning_sent = False
-        if self._session_monitor_task:
-            self._session_monitor_task.cancel()
-        self._session_monitor_task = asyncio.create_task(self._monitor_session_timeout())
-        logger.info(f"Session timer started: {self._session_id}")
+        self._session_id = f"session_{_short_id()}"
+        self._last_activity_time = time.monotonic()
+        self._arm_session_timers()
+        logger.info("Session timer started: %s", self._session_id)
 
     def stop_session_timer(self) -> None:
         """Stop session timer when audio track is unsubscribed."""
-        if self._session_monitor_task:
-            self._session_monitor_task.cancel()
-            self._session_monitor_task = None
-        logger.info(f"Session timer stopped: {self._session_id}")
+        self._cancel_session_timers()
+        logger.info("Session timer stopped: %s", self._session_id)
 
     def on_turn_completed(self) -> None:
         """Reset inactivity timer when user completes a turn."""
-        self._last_activity_time = time.time()
-        self._session_warning_sent = False
-        logger.debug(f"Turn completed, timer reset: {self._session_id}")
+        self._last_activity_time = time.monotonic()
+        # Re-arm the deadlines unless the timer is stopped or already timed out
+        if self._timeout_handle:
+            self._arm_session_timers()
+        logger.debug("Turn completed, timer reset: %s", self._session_id)
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run a coroutine in the background, keeping it alive until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _arm_session_timers(self) -> None:
+        """Schedule the warning and timeout callbacks from now."""
+        self._cancel_session_timers()
+        loop = asyncio.get_running_loop()
+        self._warning_handle = loop.call_later(SESSION_WARNING_THRESHOLD, self._on_session_warning)
+        self._timeout_handle = loop.call_later(SESSION_TIMEOUT, self._on_session_timeout)
+
+    def _cancel_session_timers(self) -> None:
+        """Cancel pending warning/timeout callbacks, if any."""
+        if self._warning_handle:
+            self._warning_handle.cancel()
+            self._warning_handle = None
+        if self._timeout_handle:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
+
+    def _on_session_warning(self) -> None:
+        """Warn the frontend at 55s of inactivity."""
+        self._warning_handle = None
+        remaining = SESSION_TIMEOUT - SESSION_WARNING_THRESHOLD
+        self._spawn(
+            self._send_session_notification(
+                NotificationType.SESSION_WARNING, remaining_seconds=int(remaining)
+            )
+        )
+        logger.info("Session warning: %.0fs remaining", remaining)
+
+    def _on_session_timeout(self) -> None:
+        """Time the session out at 60s of inactivity."""
+        self._timeout_handle = None
+        now = time.monotonic()
+        elapsed = now - (self._last_activity_time or now)
+        self._spawn(
+            self._send_session_notification(
+                NotificationType.SESSION_TIMEOUT,
+                reason="inactivity",
+                idle_duration=elapsed,
+            )
+        )
+        logger.info("Session timeout after %.1fs of inactivity", elapsed)
 
-    async def _monitor_session_timeout(self) -> None:
-        """Background task to monitor session inactivity and enforce timeout."""
-        try:
-            while True:
-                await asyncio.sleep(0.5)
-                if not self._last_activity_time:
-                    break
+    def on_final_transcript(self, transcript: str) -> None:
+        """Speculatively classify the user's words while end-of-turn is still pending.
 
-                elapsed = time.time() - self._last_activity_time
-
-                # Send warning at 55s of inactivity
-                if elapsed >= SESSION_WARNING_THRESHOLD and not self._session_warning_sent:
-                    remaining = int(SESSION_TIMEOUT - elapsed)
-                    await self._send_session_notification(
-                        NotificationType.SESSION_WARNING, remaining_seconds=remaining
-                    )
-                    self._session_warning_sent = True
-                    logger.info(f"Session warning: {remaining}s remaining")
-
-                # Timeout at 60s of inactivity
-                if elapsed >= SESSION_TIMEOUT:
-                    await self._send_session_notification(
-                        NotificationType.SESSION_TIMEOUT,
-                        reason="inactivity",
-                        idle_duration=elapsed,
-                    )
-                    logger.info(f"Session timeout after {elapsed:.1f}s of inactivity")
-                    break
-        except asyncio.CancelledError:
-            pass
+        The main LLM reply is already generated preemptively by the session; this
+        hides the classifier round trip behind the same end-of-turn delay.
+        """
+        self._speculative_text = f"{self._speculative_text} {transcript}".strip()
+        if not SPECULATIVE_INTENT or self._has_active_agent():
+            return
+        if _TASK_TRIGGER_RE.match(self._speculative_text):
+            return  # Routed without the classifier anyway
+        if self._speculative_intent:
+            self._speculative_intent[1].cancel()
+        task = asyncio.create_task(
+            classify_intent_cached(self._speculative_text, self._settings.llm_model)
+        )
+        # Retrieve the result of abandoned speculations so errors aren't reported as unhandled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._speculative_intent = (self._speculative_text, task)
+
+    def _has_active_agent(self) -> bool:
+        """Whether a task/notes conversation is receiving all messages."""
+        return bool(
+            (self._task_agent and self._task_agent.is_active)
+            or (self._basidian_agent and self._basidian_agent.is_active)
+        )
+
+    async def _classify(
+        self, text: str, speculative: tuple[str, asyncio.Task[IntentClassification]] | None
+    ) -> IntentClassification:
+        """Classify text, reusing a speculative classification of the same words."""
+        if speculative:
+            speculative_text, task = speculative
+            if speculative_text == text.strip():
+                return await task
+            task.cancel()
+        return await classify_intent_cached(text, self._settings.llm_model)
 
     async def _process_input(self, text: str) -> Result[str | None]:
         """Process user input. Returns Ok(response) or Ok(None) for default LLM, Err on failure."""
+        # Consume this turn's speculation, if any
+        speculative, self._speculative_intent = self._speculative_intent, None
+        self._speculative_text = ""
 
         task_agent_enabled = "task" not in self._settings.excluded_agents
         basidian_agent_enabled = "basidian" not in self._settings.excluded_agents
@@ -201,19 +447,24 @@ class ChatAgent(Agent):
             self._current_response_type = "notes_response"
             return await self._route_to_basidian_agent(text)
 
+        # Obvious task commands don't need an LLM round trip
+        if task_agent_enabled and _TASK_TRIGGER_RE.match(text.lstrip()):
+            logger.debug("Intent: task_management (command prefix)")
+            self._current_intent = Intent.TASK_MANAGEMENT
+            self._current_response_type = "task_response"
+            return await self._route_to_task_agent(text)
+
         # Classify intent
         try:
-            classification = await classify_intent(
-                [("user", text)], model_id=self._settings.llm_model
-            )
+            classification = await self._classify(text, speculative)
         except Exception as e:
-            logger.error(f"Intent classification failed: {e}", exc_info=True)
+            logger.error("Intent classification failed: %s", e, exc_info=True)
             self._current_intent = None
             self._current_response_type = "error"
             return Err(f"Configuration error: {e}")
 
         logger.debug(
-            f"Intent: {classification.intent} (confidence: {classification.confidence:.2f})"
+            "Intent: %s (confidence: %.2f)", classification.intent, classification.confidence
         )
 
         # Store intent for response metadata
@@ -248,13 +499,13 @@ class ChatAgent(Agent):
         try:
             response = await self._task_agent.process_message(text)
         except Exception as e:
-            logger.error(f"TaskAgent failed: {e}", exc_info=True)
+            logger.error("TaskAgent failed: %s", e, exc_info=True)
             return Err("Sorry, I couldn't process that task request.")
 
-        logger.info(f"TaskAgent response: {response.text[:100]}...")
+        logger.info("TaskAgent response: %.100s...", response.text)
 
         if response.should_exit:
-            logger.info(f"TaskAgent exiting: {response.exit_reason}")
+            logger.info("TaskAgent exiting: %s", response.exit_reason)
             self._task_agent = None
 
         return Ok(response.text)
@@ -273,13 +524,13 @@ class ChatAgent(Agent):
         try:
             response = await self._basidian_agent.process_message(text)
         except Exception as e:
-            logger.error(f"BasidianAgent failed: {e}", exc_info=True)
+            logger.error("BasidianAgent failed: %s", e, exc_info=True)
             return Err("Sorry, I couldn't process that notes request.")
 
-        logger.info(f"BasidianAgent response: {response.text[:100]}...")
+        logger.info("BasidianAgent response: %.100s...", response.text)
 
         if response.should_exit:
-            logger.info(f"BasidianAgent exiting: {response.exit_reason}")
+            logger.info("BasidianAgent exiting: %s", response.exit_reason)
             self._basidian_agent = None
 
         return Ok(response.text)
@@ -314,7 +565,7 @@ class ChatAgent(Agent):
 
     async def _generate_llm(self, user_input: str) -> AsyncIterable[str]:
         """Generate response chunks from LLM."""
-        llm_client = create_chat_llm(self._settings.llm_model)
+        llm_client = _chat_llm(self._settings.llm_model)
 
         async for chunk in llm_client.astream([("user", user_input)]):
             if chunk.content and isinstance(chunk.content, str):
@@ -326,25 +577,15 @@ class ChatAgent(Agent):
             logger.warning("Cannot send: no room")
             return
 
-        self._segment_id = f"RESP_{uuid.uuid4().hex[:8]}"
-        attrs = {
-            ATTR_SEGMENT_ID: self._segment_id,
-            ATTR_TRANSCRIPTION_FINAL: "false",
-            ATTR_RESPONSE_TYPE: self._current_response_type,
-            ATTR_MODEL: self._settings.llm_model,
-        }
-        if self._current_intent:
-            attrs[ATTR_INTENT] = self._current_intent
-        writer = await self._room.local_participant.stream_text(
-            topic=TOPIC_LLM_STREAM,
-            attributes=attrs,
-        )
-
+        self._segment_id = f"RESP_{self._id_prefix}_{next(self._segment_seq)}"
+        # Own sender: a text reply may overlap a voice turn on the same agent
+        sender = _SegmentSender(self._room, self._stream_attributes())
         try:
             async for chunk in chunks:
-                await writer.write(chunk)
+                if chunk:
+                    await sender.put(chunk)
         finally:
-            await writer.aclose()
+            await sender.close()
 
     async def _speak_and_stop(self, text: str) -> None:
         """Stream response and stop default voice flow."""
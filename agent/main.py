@@ -1,6 +1,6 @@
 import asyncio
-import json
 import logging
+import operator
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -17,13 +17,19 @@ from livekit.agents import (
     metrics,
     room_io,
 )
-from livekit.agents.voice import UserStateChangedEvent
+from livekit.agents.voice import UserInputTranscribedEvent, UserStateChangedEvent
 from livekit.plugins import silero
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
 from agent.chat_agent import ChatAgent
 from agent.constants import TOPIC_TEXT_INPUT
-from agent.settings import AgentSettings, NotificationType, get_settings_from_metadata
+from agent.settings import (
+    AgentSettings,
+    NotificationType,
+    PluginCache,
+    get_settings_from_metadata,
+    parse_metadata,
+)
 from agent.transcribe_agent import TranscribeAgent
 
 load_dotenv()
@@ -31,14 +37,31 @@ load_dotenv()
 logger = logging.getLogger("voice-agent")
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     """Mutable state for an agent session."""
 
     settings: AgentSettings = field(default_factory=AgentSettings)
     agent: "ChatAgent | None" = None
     session: "AgentSession[Any] | None" = None
+    started: bool = False
+    # Latest settings requested via metadata; applied under settings_lock
+    desired_settings: AgentSettings | None = None
+    # Last raw metadata seen per participant identity
+    last_metadata: dict[str, str] = field(default_factory=dict)
+    # Debounce timer for a burst of metadata updates (None once it has fired)
+    pending_sync: asyncio.TimerHandle | None = None
+
+
+# Metadata updates within this window collapse into one settings switch
+SETTINGS_DEBOUNCE = 0.1  # seconds
+
+# Settings the agent's STT/LLM/TTS pipeline is built from
+_pipeline_settings = operator.attrgetter("agent_mode", "stt_provider", "llm_model", "tts_enabled")
 
+# The session shallow-copies these before adjusting them, so they can be shared
+ROOM_OPTS_CHAT = room_io.RoomOptions(text_output=True, audio_output=True)
+ROOM_OPTS_TRANSCRIBE = room_io.RoomOptions(text_output=True, audio_output=False)
 
 server = AgentServer(port=8081)
 
@@ -53,32 +76,45 @@ server.setup_fnc = prewarm
 
 @server.rtc_session()
 async def entrypoint(ctx: JobContext):
-    logger.info(f"Starting voice agent for room: {ctx.room.name}")
+    logger.info("Starting voice agent for room: %s", ctx.room.name)
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
 
     initial_settings = get_settings_from_metadata(ctx)
-    logger.info(f"Initial settings: {initial_settings}")
+    logger.info("Initial settings: %s", initial_settings)
+
+    # One turn detector per job: it binds to the job's inference executor, so
+    # it can't be built in prewarm, but every session in this job can share it.
+    turn_detection = MultilingualModel()
+    # STT/LLM/TTS instances shared by this job's agents; they use the job's
+    # HTTP session, so they are closed with the job rather than kept per process
+    plugins = PluginCache()
+    ctx.add_shutdown_callback(plugins.aclose)
+
+    def new_session() -> AgentSession[Any]:
+        """Create an agent session reusing the prewarmed VAD and turn detector."""
+        return AgentSession(
+            vad=ctx.proc.userdata["vad"],
+            turn_detection=turn_detection,
+            preemptive_generation=True,
+        )
 
-    # Session state - single object holds all mutable state
+    # Session state - single object holds all mutable state. The AgentSession
+    # itself is created when a voice session actually starts.
     state = SessionState(
         settings=initial_settings,
-        session=AgentSession(
-            vad=ctx.proc.userdata["vad"],
-            turn_detection=MultilingualModel(),
-            preemptive_generation=True,
-        ),
+        desired_settings=initial_settings,
     )
 
     def create_agent(settings: AgentSettings) -> Agent:
         """Create agent based on current settings."""
         if settings.agent_mode == "chat":
-            agent = ChatAgent(settings)
+            agent = ChatAgent(settings, plugins)
             agent.set_room(ctx.room)
             state.agent = agent
             return agent
         else:
             state.agent = None
-            return TranscribeAgent(settings)
+            return TranscribeAgent(settings, plugins)
 
     # Register text input handler (works without voice session)
     def on_text_input(reader: rtc.TextStreamReader, participant_id: str):
@@ -90,11 +126,11 @@ async def entrypoint(ctx: JobContext):
                 if not text.strip():
                     return
 
-                logger.info(f"Processing text input: {text[:50]}...")
+                logger.info("Processing text input: %.50s...", text)
 
                 # Create agent if none exists (text before voice)
                 if not state.agent:
-                    state.agent = ChatAgent(state.settings)
+                    state.agent = ChatAgent(state.settings, plugins)
                     state.agent.set_room(ctx.room)
                     logger.info("Created ChatAgent for text input")
 
@@ -105,7 +141,7 @@ async def entrypoint(ctx: JobContext):
 
                 logger.info("Text response complete")
             except Exception as e:
-                logger.error(f"Text input failed: {e}", exc_info=True)
+                logger.error("Text input failed: %s", e, exc_info=True)
 
         asyncio.create_task(_handle())
 
@@ -114,15 +150,19 @@ async def entrypoint(ctx: JobContext):
 
     def on_stt_metrics(m: metrics.STTMetrics):
         """Log STT metrics including provider and audio duration."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(
-            f"STT call: provider={state.settings.stt_provider} "
-            f"audio_duration={m.audio_duration:.2f}s "
-            f"latency={m.duration:.2f}s streamed={m.streamed}"
+            "STT call: provider=%s audio_duration=%.2fs latency=%.2fs streamed=%s",
+            state.settings.stt_provider,
+            m.audio_duration,
+            m.duration,
+            m.streamed,
         )
 
     def on_user_state_changed(ev: UserStateChangedEvent):
         """Reset inactivity timer when user completes a turn."""
-        logger.debug(f"User state changed: {ev.old_state} -> {ev.new_state}")
+        logger.debug("User state changed: %s -> %s", ev.old_state, ev.new_state)
         if not state.agent or not isinstance(state.agent, ChatAgent):
             return
 
@@ -130,19 +170,26 @@ async def entrypoint(ctx: JobContext):
         if ev.old_state == "speaking" and ev.new_state != "speaking":
             state.agent.on_turn_completed()
 
+    def on_user_input_transcribed(ev: UserInputTranscribedEvent):
+        """Let the chat agent classify intent before end-of-turn is detected."""
+        if ev.is_final and isinstance(state.agent, ChatAgent):
+            state.agent.on_final_transcript(ev.transcript)
+
     async def _start_session():
         """Start agent session when user enables mic."""
-        assert state.session is not None
+        if state.session is None:
+            state.session = new_session()
         agent = create_agent(state.settings)
         await state.session.start(
             agent=agent,
             room=ctx.room,
-            room_options=room_io.RoomOptions(
-                text_output=True,
-                audio_output=(state.settings.agent_mode == "chat"),
+            room_options=(
+                ROOM_OPTS_CHAT if state.settings.agent_mode == "chat" else ROOM_OPTS_TRANSCRIBE
             ),
         )
+        state.started = True
         state.session.on("user_state_changed", on_user_state_changed)
+        state.session.on("user_input_transcribed", on_user_input_transcribed)
         if state.session.stt:
             state.session.stt.on("metrics_collected", on_stt_metrics)
 
@@ -153,50 +200,84 @@ async def entrypoint(ctx: JobContext):
 
     async def _stop_session():
         """Stop agent session when user disables mic."""
-        assert state.session is not None
         if state.agent and isinstance(state.agent, ChatAgent):
             state.agent.stop_session_timer()
 
-        await state.session.aclose()
-        # Recreate session for next connection
-        state.session = AgentSession(
-            vad=ctx.proc.userdata["vad"],
-            turn_detection=MultilingualModel(),
-            preemptive_generation=True,
-        )
+        if state.session is not None:
+            await state.session.aclose()
+        state.started = False
+        # The next _start_session creates a fresh session on demand
+        state.session = None
         state.agent = None
 
     async def _apply_settings(new_settings: AgentSettings):
         """Apply new settings, restarting session if needed."""
-        assert state.session is not None
         old = state.settings
 
         if new_settings == old:
             return
 
-        logger.info(f"Settings changed: {old} -> {new_settings}")
+        logger.info("Settings changed: %s -> %s", old, new_settings)
         state.settings = new_settings
 
-        await state.session.aclose()
-        state.session = AgentSession(
-            vad=ctx.proc.userdata["vad"],
-            turn_detection=MultilingualModel(),
-            preemptive_generation=True,
-        )
+        # Pipeline unchanged (e.g. only excluded_agents): keep the running agent,
+        # and with it any active task/notes conversation.
+        if state.started and _pipeline_settings(new_settings) == _pipeline_settings(old):
+            if isinstance(state.agent, ChatAgent):
+                state.agent.update_settings(new_settings)
+            return
+
+        # Same mode: hand the running session a new agent. VAD, turn detection
+        # and room I/O stay as they are; only STT/LLM/TTS change with the agent.
+        if state.started and state.session and new_settings.agent_mode == old.agent_mode:
+            if isinstance(state.agent, ChatAgent):
+                state.agent.stop_session_timer()
+            agent = create_agent(new_settings)
+            state.session.update_agent(agent)
+            if isinstance(agent, ChatAgent):
+                agent.start_session_timer()
+            return
+
+        # Mode change toggles audio output, which needs a fresh session. The
+        # outgoing agent's deadlines would otherwise still fire and end it.
+        if isinstance(state.agent, ChatAgent):
+            state.agent.stop_session_timer()
+        if state.session is not None:
+            await state.session.aclose()
+        state.session = new_session()
 
         agent = create_agent(new_settings)
         await state.session.start(
             agent=agent,
             room=ctx.room,
-            room_options=room_io.RoomOptions(
-                text_output=True,
-                audio_output=(new_settings.agent_mode == "chat"),
+            room_options=(
+                ROOM_OPTS_CHAT if new_settings.agent_mode == "chat" else ROOM_OPTS_TRANSCRIBE
             ),
         )
+        state.started = True
         state.session.on("user_state_changed", on_user_state_changed)
+        state.session.on("user_input_transcribed", on_user_input_transcribed)
         if state.session.stt:
             state.session.stt.on("metrics_collected", on_stt_metrics)
 
+    settings_lock = asyncio.Lock()
+
+    async def _sync_settings():
+        """Converge on the latest desired settings, one switch at a time.
+
+        Overlapping metadata events queue here instead of racing on the
+        session; by the time a waiter gets the lock it either has nothing left
+        to do or jumps straight to the newest settings.
+        """
+        async with settings_lock:
+            while state.desired_settings and state.desired_settings != state.settings:
+                await _apply_settings(state.desired_settings)
+
+    def _on_settings_debounced():
+        """A burst of metadata updates has settled; sync once."""
+        state.pending_sync = None
+        asyncio.create_task(_sync_settings())
+
     @ctx.room.on("track_subscribed")
     def on_track_subscribed(
         track: rtc.Track,
@@ -205,7 +286,7 @@ async def entrypoint(ctx: JobContext):
     ):
         """Start agent session when user's audio track is subscribed."""
         if track.kind == rtc.TrackKind.KIND_AUDIO:
-            logger.info(f"Audio track subscribed from {participant.identity}")
+            logger.info("Audio track subscribed from %s", participant.identity)
             asyncio.create_task(_start_session())
 
     @ctx.room.on("track_unsubscribed")
@@ -216,19 +297,27 @@ async def entrypoint(ctx: JobContext):
     ):
         """Stop agent session when user's audio track is unsubscribed."""
         if track.kind == rtc.TrackKind.KIND_AUDIO:
-            logger.info(f"Audio track unsubscribed from {participant.identity}")
+            logger.info("Audio track unsubscribed from %s", participant.identity)
             asyncio.create_task(_stop_session())
 
     @ctx.room.on("participant_metadata_changed")
     def on_metadata_changed(participant, prev_metadata):
-        if participant.metadata:
-            try:
-                meta = json.loads(participant.metadata)
-                new_settings = AgentSettings.from_dict(meta)
-                if new_settings != state.settings:
-                    asyncio.create_task(_apply_settings(new_settings))
-            except json.JSONDecodeError:
-                pass
+        # Skip re-emitted payloads without parsing them
+        if state.last_metadata.get(participant.identity) == participant.metadata:
+            return
+        state.last_metadata[participant.identity] = participant.metadata
+
+        meta = parse_metadata(participant.metadata)
+        if meta is None:
+            return
+        new_settings = AgentSettings.from_dict(meta)
+        state.desired_settings = new_settings
+        if state.pending_sync:
+            state.pending_sync.cancel()
+            state.pending_sync = None
+        if new_settings != state.settings:
+            loop = asyncio.get_running_loop()
+            state.pending_sync = loop.call_later(SETTINGS_DEBOUNCE, _on_settings_debounced)
 
     # Session will be started when audio track is subscribed (user enables mic)
     logger.info("Agent ready, waiting for audio track subscription")
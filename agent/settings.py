@@ -1,9 +1,12 @@
-import json
+import asyncio
 import logging
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, fields
 from enum import StrEnum
 from typing import Any
 
+import orjson
 from livekit.agents import JobContext
 from livekit.plugins import deepgram, elevenlabs, openai
 from my_agents.models_config import AI_API_KEY, AI_BASE_URL, DEFAULT_MODEL
@@ -24,15 +27,22 @@ class NotificationType(StrEnum):
 logger = logging.getLogger("voice-agent")
 
 
-@dataclass
+def _str_tuple(value: Any) -> tuple[str, ...]:
+    """Normalize a metadata list of names; null, a bare string or other junk give ()."""
+    if not isinstance(value, list | tuple):
+        return ()
+    return tuple(item for item in value if isinstance(item, str))
+
+
+@dataclass(frozen=True, slots=True)
 class AgentSettings:
-    """Configuration for agent behavior."""
+    """Configuration for agent behavior (immutable; replaced on change)."""
 
     stt_provider: str = "deepgram"
     llm_model: str = DEFAULT_MODEL
     tts_enabled: bool = True
     agent_mode: str = "chat"
-    excluded_agents: list[str] = field(default_factory=list)
+    excluded_agents: tuple[str, ...] = ()
 
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> "AgentSettings":
@@ -41,19 +51,23 @@ class AgentSettings:
             llm_model=d.get("llm_model", DEFAULT_MODEL),
             tts_enabled=d.get("tts_enabled", True),
             agent_mode=d.get("agent_mode", "chat"),
-            excluded_agents=d.get("excluded_agents", []),
+            excluded_agents=_str_tuple(d.get("excluded_agents")),
         )
 
 
-def create_stt(provider: str):
-    """Create STT instance based on provider name."""
+# Metadata keys that map onto AgentSettings; anything else is ignored
+SETTINGS_KEYS = frozenset(f.name for f in fields(AgentSettings))
+
+
+def create_stt(provider: str) -> deepgram.STT | elevenlabs.STT:
+    """Create the STT instance for a provider name."""
     if provider == "elevenlabs":
         return elevenlabs.STT()
     return deepgram.STT(model="nova-3")
 
 
 def create_llm(model_id: str) -> openai.LLM:
-    """Create LLM instance from model_id."""
+    """Create the LLM instance for a model_id."""
     return openai.LLM(
         model=model_id,
         base_url=AI_BASE_URL,
@@ -61,24 +75,100 @@ def create_llm(model_id: str) -> openai.LLM:
     )
 
 
+# Instances of each kind (stt/llm/tts) one job keeps before closing the least
+# recently used; counted per kind so the running agent's instances stay cached
+PLUGIN_CACHE_SIZE = 8
+
+
+class PluginCache:
+    """STT/LLM/TTS instances for one job, reused across its sessions.
+
+    Plugins bind to the job's HTTP session (utils.http_context), which is closed
+    when the job ends, and the thread executor runs several jobs in one process;
+    so each job gets its own cache and closes it on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._instances: dict[str, OrderedDict[Any, Any]] = {
+            "stt": OrderedDict(),
+            "llm": OrderedDict(),
+            "tts": OrderedDict(),
+        }
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def stt(self, provider: str) -> deepgram.STT | elevenlabs.STT:
+        """Get the STT instance for a provider name."""
+        return self._get("stt", provider, lambda: create_stt(provider))
+
+    def llm(self, model_id: str) -> openai.LLM:
+        """Get the LLM instance for a model_id."""
+        return self._get("llm", model_id, lambda: create_llm(model_id))
+
+    def tts(self, enabled: bool) -> elevenlabs.TTS | None:
+        """Get the TTS instance, or None when TTS is disabled."""
+        return self._get("tts", True, elevenlabs.TTS) if enabled else None
+
+    def _get(self, kind: str, key: Any, build: Callable[[], Any]) -> Any:
+        instances = self._instances[kind]
+        instance = instances.get(key)
+        if instance is not None:
+            instances.move_to_end(key)
+            return instance
+
+        instance = instances[key] = build()
+        if len(instances) > PLUGIN_CACHE_SIZE:
+            _, evicted = instances.popitem(last=False)
+            task = asyncio.create_task(evicted.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        return instance
+
+    async def aclose(self) -> None:
+        """Close every cached instance; call once the job is shutting down."""
+        instances = [instance for cache in self._instances.values() for instance in cache.values()]
+        for cache in self._instances.values():
+            cache.clear()
+        results = await asyncio.gather(
+            *(instance.aclose() for instance in instances),
+            *self._closing,
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Failed to close plugin: %s", result)
+
+
+def parse_metadata(raw: str | None) -> dict[str, Any] | None:
+    """Decode participant/room metadata. Returns None if empty or not a JSON object."""
+    if not raw:
+        return None
+    try:
+        meta = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def _merge_meta(raw: str | None, into: dict[str, Any]) -> bool:
+    """Merge the settings keys of raw metadata into `into`. Returns True if it parsed."""
+    meta = parse_metadata(raw)
+    if meta is None:
+        return False
+    into.update({key: value for key, value in meta.items() if key in SETTINGS_KEYS})
+    return True
+
+
 def get_settings_from_metadata(ctx: JobContext) -> AgentSettings:
-    """Extract settings from participant or room metadata."""
+    """Extract settings from the first participant with metadata, else the room's."""
     merged: dict[str, Any] = {}
 
     for participant in ctx.room.remote_participants.values():
-        if participant.metadata:
-            try:
-                merged.update(json.loads(participant.metadata))
-                logger.info(f"Settings from participant {participant.identity}: {merged}")
-                break
-            except json.JSONDecodeError:
-                pass
-
-    if ctx.room.metadata:
-        try:
-            merged.update(json.loads(ctx.room.metadata))
-            logger.info(f"Settings from room metadata: {merged}")
-        except json.JSONDecodeError:
-            pass
+        if _merge_meta(participant.metadata, merged):
+            logger.info("Settings from participant %s: %s", participant.identity, merged)
+            return AgentSettings.from_dict(merged)
+
+    room_metadata = ctx.room.metadata
+    if _merge_meta(room_metadata, merged):
+        logger.info("Settings from room metadata: %s", merged)
 
     return AgentSettings.from_dict(merged)
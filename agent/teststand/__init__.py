@@ -1,5 +1,17 @@
 """Test Stand TUI - A Textual-based debug interface for the agent."""
 
-from .app import TestStandApp, main
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app import TestStandApp, main
 
 __all__ = ["TestStandApp", "main"]
+
+
+def __getattr__(name: str) -> Any:
+    # Defer importing the Textual app (and everything it pulls in) until used
+    if name in __all__:
+        from . import app
+
+        return getattr(app, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
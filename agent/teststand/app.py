@@ -1,11 +1,11 @@
 """Test Stand TUI - A Textual-based debug interface for the agent."""
 
+import argparse
 import asyncio
-import uuid
+import secrets
+from collections import deque
 from typing import Any
 
-from my_agents.graph import classify_intent
-from my_agents.models import Intent
 from textual import work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
@@ -15,7 +15,7 @@ from textual.widgets import Footer, Header, Static
 
 from agent.task.task_agent import AgentResponse, TaskAgent
 
-from .logging import get_log_file_path, set_log_level, setup_file_logging, tail_log_file
+from .logging import get_log_file_path, set_log_level, setup_logging, tail_logs
 from .models import MODELS, Model, get_default_model, get_model_by_index
 from .widgets import ChatPanel, LogPanel, ParamsPanel
 
@@ -144,16 +144,18 @@ class TestStandApp(App[None]):
     ]
 
     LOG_LEVELS = ["TRACE", "DEBUG", "INFO"]
+    MAX_HISTORY = 200  # user + assistant entries kept for classification
 
-    def __init__(self) -> None:
+    def __init__(self, log_file: bool = False) -> None:
         super().__init__()
+        self._log_file = log_file
         self._model_index = 0
         self._current_model: Model = get_default_model()
         self._log_level_index = 1  # Default to DEBUG (index 1)
         self._current_log_level = self.LOG_LEVELS[self._log_level_index]
-        self._session_id = f"teststand-{uuid.uuid4().hex[:8]}"
+        self._session_id = f"teststand-{secrets.token_hex(4)}"
         self._agent: TaskAgent | None = None
-        self._history: list[tuple[str, str]] = []
+        self._history: deque[tuple[str, str]] = deque(maxlen=self.MAX_HISTORY)
         self._last_user_message: str = ""
         self._stop_log_tail = asyncio.Event()
 
@@ -168,8 +170,8 @@ class TestStandApp(App[None]):
 
     async def on_mount(self) -> None:
         """Initialize when app starts."""
-        # Setup file logging with default level (DEBUG)
-        setup_file_logging(self._current_log_level)
+        # Setup logging with default level (DEBUG)
+        setup_logging(self._current_log_level, log_file=self._log_file)
 
         # Create agent with current model
         self._agent = TaskAgent(
@@ -192,18 +194,18 @@ class TestStandApp(App[None]):
         self.query_one("#chat-input").focus()
 
     def _start_log_tail(self) -> None:
-        """Start tailing the log file in the background."""
+        """Start streaming log lines in the background."""
         self._stop_log_tail.clear()
         asyncio.create_task(self._tail_logs())
 
     async def _tail_logs(self) -> None:
-        """Tail the log file and update the log panel."""
+        """Stream log lines into the log panel."""
         log_panel = self.query_one(LogPanel)
 
         async def on_log_line(line: str) -> None:
             log_panel.add_line(line)
 
-        await tail_log_file(on_log_line, self._stop_log_tail)
+        await tail_logs(on_log_line, self._stop_log_tail)
 
     def on_chat_panel_message_submitted(self, event: ChatPanel.MessageSubmitted) -> None:
         """Handle user message submission."""
@@ -213,6 +215,10 @@ class TestStandApp(App[None]):
     @work(exclusive=True)
     async def _process_message(self, user_input: str) -> None:
         """Process user input through intent classification and routing."""
+        # Classifier stack is heavy; load it on first message, not at import
+        from my_agents.graph import classify_intent
+        from my_agents.models import Intent
+
         assert self._agent is not None, "Agent not initialized - on_mount not called?"
         chat = self.query_one(ChatPanel)
         params = self.query_one(ParamsPanel)
@@ -238,7 +244,7 @@ class TestStandApp(App[None]):
             chat.add_message("[dim]Classifying...[/dim]")
 
             # Build messages for classifier
-            messages: list[tuple[str, str] | Any] = list(self._history) + [("user", user_input)]
+            messages: list[tuple[str, str] | Any] = [*self._history, ("user", user_input)]
 
             # Classify intent
             classification = await classify_intent(messages, model_id=self._current_model.model_id)
@@ -300,9 +306,9 @@ class TestStandApp(App[None]):
         chat.add_response(response.text)
 
         # Show pending if any
-        if self._agent.has_pending and self._agent._state and self._agent._state.pending_command:
-            cmd = " ".join(self._agent._state.pending_command)
-            chat.add_pending(cmd)
+        pending = self._get_pending_command()
+        if pending:
+            chat.add_pending(pending)
 
     def _get_pending_command(self) -> str | None:
         """Get the pending command string if any."""
@@ -358,17 +364,17 @@ class TestStandApp(App[None]):
         log_panel = self.query_one(LogPanel)
         log_panel.clear()
 
-        # Also truncate log file
-        log_file = get_log_file_path()
-        log_file.write_text("")
+        # Also truncate the persisted log, if any
+        if self._log_file:
+            get_log_file_path().write_text("")
 
         # New session
-        self._session_id = f"teststand-{uuid.uuid4().hex[:8]}"
+        self._session_id = f"teststand-{secrets.token_hex(4)}"
         self._agent = TaskAgent(
             session_id=self._session_id,
             model_id=self._current_model.model_id,
         )
-        self._history = []
+        self._history.clear()
 
         # Update params
         params = self.query_one(ParamsPanel)
@@ -417,12 +423,20 @@ class TestStandApp(App[None]):
 
 def main() -> None:
     """Entry point for the test stand."""
+    parser = argparse.ArgumentParser(description="Agent test stand TUI")
+    parser.add_argument(
+        "--log-file",
+        action="store_true",
+        help=f"also write logs to {get_log_file_path()}",
+    )
+    args = parser.parse_args()
+
     # Load environment
     from dotenv import load_dotenv
 
     load_dotenv()
 
-    app = TestStandApp()
+    app = TestStandApp(log_file=args.log_file)
     app.run()
 
 
@@ -1,7 +1,16 @@
-"""File logging setup for the test stand."""
+"""Logging setup for the test stand.
 
+Records are rendered once and fanned out on a background listener thread:
+to the TUI log panel (in-process, no disk round trip) and, optionally, to a
+persistent log file.
+"""
+
+import asyncio
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 import structlog
@@ -26,59 +35,132 @@ NOISY_LOGGERS = [
     "langsmith",
 ]
 
+# Processor chains are static, so build them once at import.
+# Shared by structlog events and records from stdlib loggers.
+SHARED_PROCESSORS: list[structlog.types.Processor] = [
+    structlog.contextvars.merge_contextvars,
+    structlog.stdlib.add_logger_name,
+    structlog.processors.add_log_level,
+    structlog.processors.TimeStamper(fmt="%H:%M:%S"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.UnicodeDecoder(),
+]
+
+# structlog events are handed to stdlib logging and rendered by its formatter
+PROCESSORS: list[structlog.types.Processor] = [
+    structlog.stdlib.filter_by_level,
+    *SHARED_PROCESSORS,
+    structlog.dev.set_exc_info,
+    structlog.processors.format_exc_info,
+    structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+]
+
+# Handlers run on this listener's thread, off the event loop
+_listener: QueueListener | None = None
+
+# (loop, queue) pairs registered by tail_logs
+_subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Queue[str]]] = set()
+
+
+class _SubscriberHandler(logging.Handler):
+    """Hand rendered lines to tail_logs subscribers on their event loops."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # The QueueHandler already rendered the record into its message
+        line = record.getMessage()
+        for loop, lines in tuple(_subscribers):
+            try:
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+            except RuntimeError:  # loop closed
+                _subscribers.discard((loop, lines))
+
 
-def setup_file_logging(log_level: str = "DEBUG") -> Path:
-    """Configure structlog to write to the test stand log file.
+class _TruncatingFileHandler(logging.FileHandler):
+    """FileHandler that truncates on open and appends with O_APPEND.
 
-    Returns the path to the log file.
+    O_APPEND keeps writes at the end if the file is truncated externally
+    (e.g. clear all). Records are flushed as they are written, on the
+    listener thread, so `tail -f` follows along and a crash loses nothing.
     """
-    # Ensure log directory exists
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Truncate log file on start
-    LOG_FILE.write_text("")
+    def _open(self):
+        fd = os.open(self.baseFilename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        return open(fd, "a", encoding=self.encoding, errors=self.errors)
+
+
+def _stop_listener() -> None:
+    """Flush and stop the background log writer, if running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def _gate_noisy_loggers(log_level: str) -> None:
+    """Hold noisy libraries at WARNING unless TRACE is selected.
+
+    The level is set on the library loggers themselves, so their chatty
+    debug/info calls are rejected before a LogRecord is ever built.
+    """
+    noisy_level = TRACE if log_level.upper() == "TRACE" else logging.WARNING
+    for logger_name in NOISY_LOGGERS:
+        noisy_logger = logging.getLogger(logger_name)
+        noisy_logger.setLevel(noisy_level)
 
-    # Open file for writing
-    log_file = open(LOG_FILE, "a")  # noqa: SIM115
 
-    # Shared processors
-    shared_processors: list[structlog.types.Processor] = [
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="%H:%M:%S"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.UnicodeDecoder(),
-    ]
+def setup_logging(log_level: str = "DEBUG", log_file: bool = False) -> Path | None:
+    """Configure structlog and stdlib logging for the test stand.
 
-    # Configure structlog to write to file with plain text
+    Lines always go to tail_logs subscribers. With log_file=True they are also
+    written to LOG_FILE (truncated first); its path is returned in that case.
+    """
+    handlers: list[logging.Handler] = [_SubscriberHandler()]
+    if log_file:
+        # Ensure log directory exists
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+        # The handler truncates the previous run's log as it opens
+        handlers.append(_TruncatingFileHandler(LOG_FILE, encoding="utf-8"))
+
+    # Background listener owns the outputs; callers only enqueue records
+    _stop_listener()
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    global _listener
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    # Records are rendered to plain text before they are queued
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.dev.ConsoleRenderer(colors=False),
+            ],
+            foreign_pre_chain=SHARED_PROCESSORS,
+        )
+    )
+
+    # Configure structlog to route through stdlib logging. filter_by_level asks
+    # the stdlib logger on every call, so bound loggers are safe to cache.
     structlog.configure(
-        processors=[
-            *shared_processors,
-            structlog.processors.format_exc_info,
-            structlog.dev.ConsoleRenderer(colors=False),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, log_level.upper())),
+        processors=PROCESSORS,
+        wrapper_class=structlog.BoundLogger,
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=log_file),
-        cache_logger_on_first_use=False,  # Allow reconfiguration
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
     )
 
     # Also configure standard library logging
-    numeric_level = TRACE if log_level.upper() == "TRACE" else getattr(logging, log_level.upper())
-    logging.basicConfig(
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-        datefmt="%H:%M:%S",
-        level=numeric_level,
-        handlers=[logging.FileHandler(LOG_FILE, mode="a")],
-        force=True,
-    )
+    logging.basicConfig(handlers=[queue_handler], force=True)
+    set_log_level(log_level)
 
-    # Suppress noisy loggers unless at TRACE level
-    noisy_level = TRACE if log_level.upper() == "TRACE" else logging.WARNING
-    for logger_name in NOISY_LOGGERS:
-        logging.getLogger(logger_name).setLevel(noisy_level)
-
-    return LOG_FILE
+    return LOG_FILE if log_file else None
 
 
 def set_log_level(log_level: str) -> None:
@@ -88,22 +170,11 @@ def set_log_level(log_level: str) -> None:
         log_level: One of TRACE, DEBUG, INFO
     """
     numeric_level = TRACE if log_level.upper() == "TRACE" else getattr(logging, log_level.upper())
-    # structlog doesn't support custom levels, use DEBUG for TRACE
-    structlog_level = logging.DEBUG if log_level.upper() == "TRACE" else numeric_level
-
-    # Reconfigure structlog
-    structlog.configure(
-        wrapper_class=structlog.make_filtering_bound_logger(structlog_level),
-        cache_logger_on_first_use=False,
-    )
-
     # Reconfigure root logger
     logging.getLogger().setLevel(numeric_level)
 
     # Suppress noisy loggers unless at TRACE level
-    noisy_level = TRACE if log_level.upper() == "TRACE" else logging.WARNING
-    for logger_name in NOISY_LOGGERS:
-        logging.getLogger(logger_name).setLevel(noisy_level)
+    _gate_noisy_loggers(log_level)
 
 
 def get_log_file_path() -> Path:
@@ -111,30 +182,29 @@ def get_log_file_path() -> Path:
     return LOG_FILE
 
 
-async def tail_log_file(callback, stop_event):
-    """Tail the log file and call callback with new lines.
+async def tail_logs(callback, stop_event):
+    """Call callback with each rendered log line until stop_event is set.
 
     Args:
         callback: Async function to call with each new line
         stop_event: asyncio.Event to signal when to stop
     """
-    import asyncio
-
-    import aiofiles
-
-    # Wait for file to exist
-    while not LOG_FILE.exists():
-        if stop_event.is_set():
-            return
-        await asyncio.sleep(0.1)
-
-    async with aiofiles.open(LOG_FILE) as f:
-        # Seek to end
-        await f.seek(0, os.SEEK_END)
+    lines: asyncio.Queue[str] = asyncio.Queue()
+    subscriber = (asyncio.get_running_loop(), lines)
+    _subscribers.add(subscriber)
+    stopped = asyncio.ensure_future(stop_event.wait())
 
+    try:
         while not stop_event.is_set():
-            line = await f.readline()
-            if line:
-                await callback(line.rstrip())
-            else:
-                await asyncio.sleep(0.1)
+            getter = asyncio.ensure_future(lines.get())
+            await asyncio.wait((getter, stopped), return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                break
+            await callback(getter.result())
+            # Drain the rest of a burst without another wait round-trip
+            while not lines.empty():
+                await callback(lines.get_nowait())
+    finally:
+        _subscribers.discard(subscriber)
+        stopped.cancel()
@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Model:
     """Simple model reference for the test stand UI."""
 
@@ -18,9 +18,17 @@ MODELS = [
     Model(model_id="moonshotai/kimi-k2-instruct", display_name="kimi-k2-instruct"),
 ]
 
+# Lookups derived once at import
+_N_MODELS = len(MODELS)
+_MODELS_BY_NAME = {m.display_name: m for m in MODELS}
+
 
 def get_model_by_index(index: int) -> Model:
-    return MODELS[index % len(MODELS)]
+    return MODELS[index % _N_MODELS]
+
+
+def get_model_by_display_name(name: str) -> Model:
+    return _MODELS_BY_NAME[name]
 
 
 def get_default_model() -> Model:
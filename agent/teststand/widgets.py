@@ -1,11 +1,17 @@
 """Custom widgets for the test stand TUI."""
 
+import re
+
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.message import Message
 from textual.widget import Widget
 from textual.widgets import Button, Input, RichLog, Static
 
+# Log line coloring: one case-insensitive scan instead of lowercasing the line
+_LEVEL_RE = re.compile(r"error|warning", re.IGNORECASE)
+_LEVEL_STYLES = {"error": "red", "warning": "yellow"}
+
 
 class ChatMessage(Static):
     """A single message in the chat panel."""
@@ -59,7 +65,42 @@ class RetryButton(Widget):
             self.post_message(self.Retry())
 
 
-class ChatPanel(Widget):
+class _BufferedLogWidget(Widget):
+    """Widget whose RichLog writes are batched into one flush per burst."""
+
+    # Seconds to collect writes before rendering them together
+    FLUSH_DELAY = 0.02
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._log: RichLog | None = None
+        self._buf: list[str] = []
+        self._flush_scheduled = False
+
+    def _write(self, markup: str) -> None:
+        """Queue a line for the next flush."""
+        self._buf.append(markup)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.set_timer(self.FLUSH_DELAY, self._flush)
+
+    def _flush(self) -> None:
+        """Write all buffered lines to the log."""
+        self._flush_scheduled = False
+        lines, self._buf = self._buf, []
+        if self._log is None:
+            return
+        for line in lines:
+            self._log.write(line)
+
+    def clear(self) -> None:
+        """Clear the log, dropping any lines not yet flushed."""
+        self._buf.clear()
+        if self._log is not None:
+            self._log.clear()
+
+
+class ChatPanel(_BufferedLogWidget):
     """The main chat panel with conversation history and input."""
 
     class MessageSubmitted(Message):
@@ -73,18 +114,18 @@ class ChatPanel(Widget):
         yield RichLog(id="chat-log", highlight=True, markup=True, wrap=True)
         yield Input(id="chat-input", placeholder="Type a message...")
 
+    def on_mount(self) -> None:
+        # Resolve once; add_message runs for every chat update
+        self._log = self.query_one("#chat-log", RichLog)
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.value.strip():
             self.post_message(self.MessageSubmitted(event.value))
             event.input.value = ""
 
-    def add_message(self, content: str, style: str = "") -> None:
-        """Add a message to the chat log."""
-        log = self.query_one("#chat-log", RichLog)
-        if style:
-            log.write(f"[{style}]{content}[/{style}]")
-        else:
-            log.write(content)
+    def add_message(self, markup: str) -> None:
+        """Add an already-styled message to the chat log."""
+        self._write(markup)
 
     def add_user_message(self, text: str) -> None:
         """Add a user message."""
@@ -110,34 +151,27 @@ class ChatPanel(Widget):
         """Add pending action indicator."""
         self.add_message(f"[yellow][Pending] {command}[/yellow]")
 
-    def clear(self) -> None:
-        """Clear the chat log."""
-        log = self.query_one("#chat-log", RichLog)
-        log.clear()
-
 
-class LogPanel(Widget):
-    """The log panel showing tailed log file."""
+class LogPanel(_BufferedLogWidget):
+    """The log panel showing streamed log lines."""
 
     def compose(self) -> ComposeResult:
         yield Static("[bold]Logs[/bold]", classes="panel-header")
         yield RichLog(id="log-display", highlight=True, markup=True, wrap=True)
 
+    def on_mount(self) -> None:
+        # Resolve once; add_line runs for every tailed log line
+        self._log = self.query_one("#log-display", RichLog)
+
     def add_line(self, line: str) -> None:
         """Add a log line."""
-        log = self.query_one("#log-display", RichLog)
-        # Color errors red
-        if "error" in line.lower():
-            log.write(f"[red]{line}[/red]")
-        elif "warning" in line.lower():
-            log.write(f"[yellow]{line}[/yellow]")
+        # Color errors red, warnings yellow
+        match = _LEVEL_RE.search(line)
+        if match:
+            style = _LEVEL_STYLES[match.group().lower()]
+            self._write(f"[{style}]{line}[/{style}]")
         else:
-            log.write(line)
-
-    def clear(self) -> None:
-        """Clear the log display."""
-        log = self.query_one("#log-display", RichLog)
-        log.clear()
+            self._write(line)
 
 
 class ParamsPanel(Widget):
@@ -150,6 +184,7 @@ class ParamsPanel(Widget):
         self._is_active = False
         self._pending = None
         self._log_level = "DEBUG"
+        self._labels: dict[str, Static] = {}
 
     def compose(self) -> ComposeResult:
         yield Static("[bold]Parameters[/bold]", classes="panel-header")
@@ -160,33 +195,42 @@ class ParamsPanel(Widget):
         yield Static(id="param-pending")
 
     def on_mount(self) -> None:
+        # Resolve the value widgets once instead of querying on every update
+        for name in ("model", "log-level", "session", "active", "pending"):
+            self._labels[name] = self.query_one(f"#param-{name}", Static)
         self._update_display()
 
     def _update_display(self) -> None:
-        self.query_one("#param-model", Static).update(f"Model: {self._model}")
-        self.query_one("#param-log-level", Static).update(f"Log: {self._log_level}")
-        self.query_one("#param-session", Static).update(f"Session: {self._session_id[:8]}...")
-        active_str = "[green]Yes[/green]" if self._is_active else "[dim]No[/dim]"
-        self.query_one("#param-active", Static).update(f"Active: {active_str}")
-        pending_str = self._pending if self._pending else "[dim]None[/dim]"
-        self.query_one("#param-pending", Static).update(f"Pending: {pending_str}")
+        """Render every field (used on mount)."""
+        self.set_model(self._model)
+        self.set_log_level(self._log_level)
+        self.set_session_id(self._session_id)
+        self.set_active(self._is_active)
+        self.set_pending(self._pending)
+
+    def _set_label(self, name: str, text: str) -> None:
+        label = self._labels.get(name)
+        if label is not None:
+            label.update(text)
 
     def set_model(self, model: str) -> None:
         self._model = model
-        self._update_display()
+        self._set_label("model", f"Model: {model}")
 
     def set_session_id(self, session_id: str) -> None:
         self._session_id = session_id
-        self._update_display()
+        self._set_label("session", f"Session: {session_id[:8]}...")
 
     def set_active(self, is_active: bool) -> None:
         self._is_active = is_active
-        self._update_display()
+        active_str = "[green]Yes[/green]" if is_active else "[dim]No[/dim]"
+        self._set_label("active", f"Active: {active_str}")
 
     def set_pending(self, pending: str | None) -> None:
         self._pending = pending
-        self._update_display()
+        pending_str = pending if pending else "[dim]None[/dim]"
+        self._set_label("pending", f"Pending: {pending_str}")
 
     def set_log_level(self, log_level: str) -> None:
         self._log_level = log_level
-        self._update_display()
+        self._set_label("log-level", f"Log: {log_level}")
@@ -2,7 +2,7 @@ import logging
 
 from livekit.agents import Agent, StopResponse, llm
 
-from agent.settings import AgentSettings, create_stt
+from agent.settings import AgentSettings, PluginCache
 
 logger = logging.getLogger("voice-agent")
 
@@ -10,15 +10,15 @@ logger = logging.getLogger("voice-agent")
 class TranscribeAgent(Agent):
     """Transcribe mode: STT only, emit transcripts without LLM response"""
 
-    def __init__(self, settings: AgentSettings):
+    def __init__(self, settings: AgentSettings, plugins: PluginCache):
         super().__init__(
             instructions="",
-            stt=create_stt(settings.stt_provider),
+            stt=plugins.stt(settings.stt_provider),
         )
 
     async def on_user_turn_completed(
         self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage
     ) -> None:
         transcript = new_message.text_content
-        logger.info(f"Transcribed: {transcript}")
+        logger.info("Transcribed: %s", transcript)
         raise StopResponse()
@@ -365,12 +365,42 @@ class LiveKitService {
     }, onError: (e) => _log.warning('Error in immediate text stream: $e'));
   }
 
-  void _onSessionNotification(
-    TextStreamReader reader,
-    String participantId,
-  ) async {
+  /// Each notification arrives as JSON on its own stream; lines are parsed as
+  /// they arrive, so several newline-separated messages in one stream also work.
+  void _onSessionNotification(TextStreamReader reader, String participantId) {
+    final pending = StringBuffer();
+
+    void drain({bool done = false}) {
+      final text = pending.toString();
+      final lines = text.split('\n');
+      // Keep a trailing partial line until the rest of it arrives
+      final rest = done ? '' : lines.removeLast();
+      pending
+        ..clear()
+        ..write(rest);
+      for (final line in lines) {
+        if (line.trim().isNotEmpty) {
+          _handleSessionNotification(line, participantId);
+        }
+      }
+    }
+
+    reader.listen(
+      (chunk) {
+        try {
+          pending.write(utf8.decode(chunk.content.toList()));
+          drain();
+        } catch (e) {
+          _log.warning('Error decoding session notification: $e');
+        }
+      },
+      onDone: () => drain(done: true),
+      onError: (e) => _log.warning('Error in session notification stream: $e'),
+    );
+  }
+
+  void _handleSessionNotification(String text, String participantId) {
     try {
-      final text = await reader.readAll();
       final json = jsonDecode(text) as Map<String, dynamic>;
 
       final typeStr = json['type'] as String?;